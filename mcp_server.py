@@ -1,26 +1,45 @@
 #!/usr/bin/env python3
 """Tempo MCP Server - log time to Tempo via simple commands."""
 
+import functools
 import json
 import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
 from typing import Optional
-from mcp.server.fastmcp import FastMCP
 import tempo_api
 
-mcp = FastMCP("tempo")
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib decoder
+    from json import loads as _json_loads
+
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# Last parsed config, keyed by the file's (path, mtime_ns, size)
+_CONFIG_CACHE: dict = {}
 
 
 def load_config() -> dict:
-    """Load Tempo configuration from ~/.tempo-config.json."""
+    """Load Tempo configuration from ~/.tempo-config.json.
+
+    The parsed result is reused until the file's mtime or size changes.
+    """
     config_path = os.path.expanduser("~/.tempo-config.json")
-    if not os.path.exists(config_path):
+    try:
+        st = os.stat(config_path)
+    except FileNotFoundError:
         raise RuntimeError(
             "Config file not found: ~/.tempo-config.json. "
             "Please create it. See README for instructions."
         )
-    with open(config_path) as f:
-        config = json.load(f)
+    key = (config_path, st.st_mtime_ns, st.st_size)
+    if _CONFIG_CACHE.get("key") == key:
+        return _CONFIG_CACHE["config"]
+    with open(config_path, "rb") as f:
+        config = _json_loads(f.read())
     if "tempoToken" not in config:
         raise RuntimeError(
             "Missing 'tempoToken' in config. Get a token at: "
@@ -30,16 +49,94 @@ def load_config() -> dict:
     env_token = os.environ.get("TEMPO_TOKEN")
     if env_token:
         config["tempoToken"] = env_token
+    for section in ("issueIds", "presets"):
+        if not isinstance(config.get(section, {}), dict):
+            raise RuntimeError(f"'{section}' in config must be an object.")
+    # Flatten presets to (issue_id, issue_key, percentage, description) once.
+    # A broken preset is recorded and reported only when it is used.
+    issue_ids = config.get("issueIds", {})
+    compiled = {}
+    preset_errors = {}
+    for name, entries in config.get("presets", {}).items():
+        try:
+            compiled[name] = _compile_preset(name, entries, issue_ids)
+        except RuntimeError as e:
+            preset_errors[name] = str(e)
+    config["_compiled_presets"] = compiled
+    config["_preset_errors"] = preset_errors
+    # Tempo issue ID → configured issue key, for labelling fetched worklogs
+    config["_reverse_issue_ids"] = {v: k for k, v in issue_ids.items()}
+    _CONFIG_CACHE["key"] = key
+    _CONFIG_CACHE["config"] = config
     return config
 
 
-try:
-    CONFIG = load_config()
-except (FileNotFoundError, RuntimeError, json.JSONDecodeError) as e:
-    CONFIG = None
-    _CONFIG_ERROR = str(e)
-else:
-    _CONFIG_ERROR = None
+def _compile_preset(name: str, entries: list, issue_ids: dict) -> list[tuple]:
+    """Validate one preset and flatten it to (issue_id, issue_key, percentage, description).
+
+    Raises:
+        RuntimeError naming the preset and the offending field.
+    """
+    if not isinstance(entries, list):
+        raise RuntimeError(f"Preset '{name}' must be a list of entries.")
+    compiled = []
+    for e in entries:
+        if not isinstance(e, dict):
+            raise RuntimeError(f"Preset '{name}' has an entry that is not an object.")
+        for field in ("issueKey", "percentage"):
+            if field not in e:
+                raise RuntimeError(f"Preset '{name}' has an entry missing '{field}'.")
+        if not isinstance(e["issueKey"], str):
+            raise RuntimeError(
+                f"Preset '{name}' has issueKey {e['issueKey']!r}; issue keys must be strings."
+            )
+        if e["issueKey"] not in issue_ids:
+            raise RuntimeError(
+                f"Preset '{name}' references '{e['issueKey']}', "
+                "which is missing from 'issueIds' in config."
+            )
+        if not isinstance(e["percentage"], (int, float)) or isinstance(e["percentage"], bool):
+            raise RuntimeError(
+                f"Preset '{name}' has percentage {e['percentage']!r} for "
+                f"'{e['issueKey']}'; percentages must be numbers."
+            )
+        compiled.append(
+            (issue_ids[e["issueKey"]], e["issueKey"], e["percentage"], e.get("description", ""))
+        )
+    return compiled
+
+
+# Config whose credentials are currently attached to the tempo_api sessions
+_SESSION_CONFIG: dict = {}
+
+
+def _get_config() -> tuple[Optional[dict], Optional[str]]:
+    """Load the config on first use (and after edits) instead of at import.
+
+    Returns:
+        Tuple of (config, error); exactly one of them is None.
+    """
+    try:
+        config = load_config()
+    except (FileNotFoundError, RuntimeError, json.JSONDecodeError) as e:
+        return None, str(e)
+    if _SESSION_CONFIG.get("config") is not config:
+        tempo_api.configure_session(config["tempoToken"])
+        if config.get("jiraEmail") and config.get("jiraToken"):
+            tempo_api.configure_jira_session(config["jiraEmail"], config["jiraToken"])
+        _SESSION_CONFIG["config"] = config
+    return config, None
+
+
+_SEC_PER_HR = 3600.0
+
+# Shared read-only default for missing nested objects in API responses
+_EMPTY: dict = {}
+
+# Jira user search results: (base_url, email, lowercased query, max_results) → (expires_at, users)
+_USER_SEARCH_TTL = 3600
+_USER_SEARCH_MAXSIZE = 128
+_USER_SEARCH_CACHE: dict[tuple[str, str, str, int], tuple[float, list[dict]]] = {}
 
 
 def parse_date(d: Optional[str]) -> str:
@@ -50,18 +147,58 @@ def parse_date(d: Optional[str]) -> str:
 
     Returns:
         ISO date string (YYYY-MM-DD).
+
+    Raises:
+        ValueError if d is not one of the accepted forms.
     """
+    return _parse_date_cached(d, date.today())
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_date_cached(d: Optional[str], today: date) -> str:
+    # `today` is part of the cache key so entries never go stale across midnight
     if not d or d == "today":
-        return date.today().isoformat()
+        return today.isoformat()
     if d == "yesterday":
-        return (date.today() - timedelta(days=1)).isoformat()
-    return d
+        return (today - timedelta(days=1)).isoformat()
+    # Reject malformed input locally instead of spending a Tempo round-trip on it
+    if _ISO_DATE_RE.fullmatch(d):
+        try:
+            date.fromisoformat(d)
+            return d
+        except ValueError:
+            pass
+    raise ValueError(f"Invalid date '{d}'. Use 'today', 'yesterday', or YYYY-MM-DD.")
+
+
+def _search_users(config: dict, query: str) -> list[dict]:
+    """Search Jira users, reusing results from the last hour for the same query.
 
+    The Jira page size comes from the optional 'jiraSearchMaxResults' config key.
 
-def _resolve_person(person: str) -> tuple[str, str]:
+    Raises:
+        tempo_api.TempoAPIError if the Jira request fails (failures are not cached).
+    """
+    jira_base_url = config["jiraBaseUrl"]
+    max_results = config.get("jiraSearchMaxResults", 10)
+    key = (jira_base_url, config["jiraEmail"], query.lower(), max_results)
+    now = time.monotonic()
+    hit = _USER_SEARCH_CACHE.get(key)
+    if hit and hit[0] > now:
+        return hit[1]
+    users = tempo_api.search_jira_users(jira_base_url, query, max_results)
+    if len(_USER_SEARCH_CACHE) >= _USER_SEARCH_MAXSIZE:
+        # Drop the oldest insertion; dicts preserve insertion order
+        _USER_SEARCH_CACHE.pop(next(iter(_USER_SEARCH_CACHE)))
+    _USER_SEARCH_CACHE[key] = (now + _USER_SEARCH_TTL, users)
+    return users
+
+
+def _resolve_person(config: dict, person: str) -> tuple[str, str]:
     """Resolve a person name/accountId to (accountId, display_label).
 
     Args:
+        config: Loaded Tempo configuration.
         person: Raw accountId (contains ':'), display name, or empty string.
 
     Returns:
@@ -72,16 +209,16 @@ def _resolve_person(person: str) -> tuple[str, str]:
     """
     if not person:
         # Default to self
-        return CONFIG["accountId"], "you"
+        return config["accountId"], "you"
 
     # Raw accountId passed directly
     if ":" in person:
         return person, person
 
     # Name search — requires Jira credentials in config
-    jira_base_url = CONFIG.get("jiraBaseUrl")
-    jira_email = CONFIG.get("jiraEmail")
-    jira_token = CONFIG.get("jiraToken")
+    jira_base_url = config.get("jiraBaseUrl")
+    jira_email = config.get("jiraEmail")
+    jira_token = config.get("jiraToken")
 
     if not jira_base_url or not jira_email or not jira_token:
         raise ValueError(
@@ -91,23 +228,37 @@ def _resolve_person(person: str) -> tuple[str, str]:
         )
 
     try:
-        users = tempo_api.search_jira_users(jira_base_url, jira_email, jira_token, person)
+        users = _search_users(config, person)
     except tempo_api.TempoAPIError as e:
         raise ValueError(f"Jira user search failed: {e}")
 
-    active = [u for u in users if u["active"]]
-    if not active:
+    if not users:
         raise ValueError(f"No active Jira user found matching '{person}'.")
-    if len(active) > 1:
-        names = ", ".join(f"{u['displayName']} ({u['emailAddress']})" for u in active)
+    if len(users) > 1:
+        names = ", ".join(f"{u['displayName']} ({u['emailAddress']})" for u in users)
         raise ValueError(
             f"Multiple users match '{person}': {names}. "
             "Be more specific or pass the accountId directly."
         )
-    u = active[0]
+    u = users[0]
     return u["accountId"], u["displayName"]
 
-@mcp.tool()
+
+def _fetch_day(account_id: str, parsed_date: str) -> tuple[dict, list[dict]]:
+    """Fetch the schedule and existing worklogs for a date in parallel.
+
+    Returns:
+        Tuple of (schedule, worklogs)
+
+    Raises:
+        tempo_api.TempoAPIError if either request fails.
+    """
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        f_sched = ex.submit(tempo_api.get_user_schedule, parsed_date, account_id)
+        f_wl = ex.submit(tempo_api.get_worklogs_for_date, account_id, parsed_date)
+        return f_sched.result(), f_wl.result()
+
+
 def tempo_log_time(
     type: str,
     date: str = "today",
@@ -131,25 +282,26 @@ def tempo_log_time(
     Returns:
         Summary of logged worklogs or an error message.
     """
-    if _CONFIG_ERROR:
-        return f"❌ Configuration error: {_CONFIG_ERROR}"
-
-    token = CONFIG["tempoToken"]
-    presets = CONFIG.get("presets", {})
-    parsed_date = parse_date(date)
+    config, config_error = _get_config()
+    if config_error:
+        return f"❌ Configuration error: {config_error}"
 
+    presets = config.get("presets", {})
     try:
-        account_id, person_label = _resolve_person(person)
+        parsed_date = parse_date(date)
+        account_id, person_label = _resolve_person(config, person)
     except ValueError as e:
         return f"❌ {e}"
 
     # Validate preset
     if type not in presets:
         return f"❌ Unknown preset '{type}'. Available: {list(presets.keys())}"
+    if type in config["_preset_errors"]:
+        return f"❌ Configuration error: {config['_preset_errors'][type]}"
 
     try:
-        # Check required hours
-        schedule = tempo_api.get_user_schedule(token, parsed_date, account_id)
+        # Check required hours and existing worklogs
+        schedule, existing = _fetch_day(account_id, parsed_date)
         required_seconds = schedule.get("requiredSeconds", 0)
 
         if required_seconds == 0 and not force:
@@ -158,40 +310,59 @@ def tempo_log_time(
                 "Use force=True to log anyway."
             )
 
-        # Check existing worklogs
-        existing = tempo_api.get_worklogs_for_date(token, account_id, parsed_date)
         if existing and not force:
             return (
                 f"⚠️ Already logged {len(existing)} worklog(s) for {parsed_date}. "
                 "Use force=True to log anyway."
             )
 
-        # Log each entry in the preset
-        preset_entries = presets[type]
+        # Log all entries in the preset in one batched submission
+        jobs = [
+            (issue_key, description or entry_desc, int(required_seconds * pct // 100), issue_id)
+            for issue_id, issue_key, pct, entry_desc in config["_compiled_presets"][type]
+        ]
+        results = tempo_api.create_worklogs_bulk([
+            tempo_api.build_worklog_payload(account_id, issue_id, seconds, parsed_date, desc)
+            for _, desc, seconds, issue_id in jobs
+        ])
+
         logged = []
-        for entry in preset_entries:
-            seconds = int(required_seconds * entry["percentage"] / 100)
-            issue_id = CONFIG["issueIds"][entry["issueKey"]]
-            desc = description or entry["description"]
-            result = tempo_api.create_worklog(
-                token, account_id, issue_id, seconds, parsed_date, desc
-            )
-            hours = seconds / 3600
+        failed = []
+        unknown = []
+        for (issue_key, desc, seconds, _), result in zip(jobs, results):
+            if isinstance(result, tempo_api.TempoAPIStatusUnknownError):
+                unknown.append(f"  • {issue_key} ({desc}): {result}")
+                continue
+            if isinstance(result, tempo_api.TempoAPIError):
+                failed.append(f"  • {issue_key} ({desc}): {result}")
+                continue
+            hours = seconds / _SEC_PER_HR
             logged.append(
-                f"  • {entry['issueKey']} ({desc}): {hours}h "
+                f"  • {issue_key} ({desc}): {hours:g}h "
                 f"[ID: {result.get('tempoWorklogId', '?')}]"
             )
 
-        total_hours = required_seconds / 3600
+        total_hours = required_seconds / _SEC_PER_HR
         for_label = f" for {person_label}" if person_label != "you" else ""
-        summary = f"✅ Logged {total_hours}h{for_label} on {parsed_date}:\n" + "\n".join(logged)
+        if failed or unknown:
+            summary = f"⚠️ Logged {len(logged)} of {len(jobs)} entries{for_label} on {parsed_date}:\n"
+            if logged:
+                summary += "\n".join(logged) + "\n"
+            if failed:
+                summary += "Failed:\n" + "\n".join(failed) + "\n"
+            if unknown:
+                summary += (
+                    "Status unknown — check with tempo_get_workload before retrying:\n"
+                    + "\n".join(unknown) + "\n"
+                )
+            return summary.rstrip("\n")
+        summary = f"✅ Logged {total_hours:g}h{for_label} on {parsed_date}:\n" + "\n".join(logged)
         return summary
 
     except tempo_api.TempoAPIError as e:
         return f"❌ Tempo API error: {e}"
 
 
-@mcp.tool()
 def tempo_get_workload(date: str = "today", person: str = "") -> str:
     """Show logged time vs expected hours for a date.
 
@@ -204,55 +375,51 @@ def tempo_get_workload(date: str = "today", person: str = "") -> str:
     Returns:
         Formatted workload summary with expected hours, logged entries, and status.
     """
-    if _CONFIG_ERROR:
-        return f"❌ Configuration error: {_CONFIG_ERROR}"
-
-    token = CONFIG["tempoToken"]
-    parsed_date = parse_date(date)
+    config, config_error = _get_config()
+    if config_error:
+        return f"❌ Configuration error: {config_error}"
 
     try:
-        account_id, person_label = _resolve_person(person)
+        parsed_date = parse_date(date)
+        account_id, person_label = _resolve_person(config, person)
     except ValueError as e:
         return f"❌ {e}"
 
     try:
-        # Get schedule
-        schedule = tempo_api.get_user_schedule(token, parsed_date, account_id)
+        # Get schedule and existing worklogs
+        schedule, worklogs = _fetch_day(account_id, parsed_date)
         required_seconds = schedule.get("requiredSeconds", 0)
         day_type = schedule.get("type", "UNKNOWN")
-        expected_hours = required_seconds / 3600
-
-        # Get existing worklogs
-        worklogs = tempo_api.get_worklogs_for_date(token, account_id, parsed_date)
+        expected_hours = required_seconds / _SEC_PER_HR
 
         for_label = f" — {person_label}" if person_label != "you" else ""
         lines = [
             f"📅 {parsed_date}{for_label} ({day_type})",
-            f"Expected: {expected_hours}h ({required_seconds}s)",
+            f"Expected: {expected_hours:g}h ({required_seconds}s)",
             "",
         ]
 
         if worklogs:
             total_logged = 0
             lines.append(f"Logged ({len(worklogs)} entries):")
+            append = lines.append
+            reverse_ids = config["_reverse_issue_ids"]
             for wl in worklogs:
                 seconds = wl.get("timeSpentSeconds", 0)
                 total_logged += seconds
-                hours = seconds / 3600
-                issue_id = wl.get("issue", {}).get("id")
-                issue_ids = CONFIG.get("issueIds", {})
-                reverse = {v: k for k, v in issue_ids.items()}
-                issue_key = reverse.get(issue_id, f"id:{issue_id}")
+                hours = seconds / _SEC_PER_HR
+                issue_id = (wl.get("issue") or _EMPTY).get("id")
+                issue_key = reverse_ids.get(issue_id) or f"id:{issue_id}"
                 desc = wl.get("description", "")
-                lines.append(f"  • {issue_key}: {hours}h — \"{desc}\"")
-            total_hours = total_logged / 3600
-            lines.append(f"Total logged: {total_hours}h")
+                append(f"  • {issue_key}: {hours:g}h — \"{desc}\"")
+            total_hours = total_logged / _SEC_PER_HR
+            lines.append(f"Total logged: {total_hours:g}h")
             lines.append("")
             if total_logged >= required_seconds:
                 lines.append("Status: ✅ Fully logged")
             else:
-                remaining = (required_seconds - total_logged) / 3600
-                lines.append(f"Status: ⚠️ {remaining}h remaining")
+                remaining = (required_seconds - total_logged) / _SEC_PER_HR
+                lines.append(f"Status: ⚠️ {remaining:g}h remaining")
         else:
             lines.append("No worklogs yet.")
 
@@ -262,7 +429,6 @@ def tempo_get_workload(date: str = "today", person: str = "") -> str:
         return f"❌ Tempo API error: {e}"
 
 
-@mcp.tool()
 def tempo_get_config() -> str:
     """Show current Tempo configuration (token is redacted).
 
@@ -272,16 +438,17 @@ def tempo_get_config() -> str:
     Returns:
         Formatted configuration summary with redacted token.
     """
-    if _CONFIG_ERROR:
+    config, config_error = _get_config()
+    if config_error:
         return (
-            f"❌ Configuration error: {_CONFIG_ERROR}\n\n"
+            f"❌ Configuration error: {config_error}\n\n"
             "To set up, create ~/.tempo-config.json with:\n"
             "  tempoToken, accountId, baseUrl, issueIds, presets\n"
             "See README for full instructions."
         )
 
     # Redact token - show only last 4 chars
-    token = CONFIG.get("tempoToken", "")
+    token = config.get("tempoToken", "")
     if len(token) > 4:
         redacted = f"****{token[-4:]}"
     else:
@@ -290,17 +457,20 @@ def tempo_get_config() -> str:
     lines = [
         "⚙️ Tempo Configuration",
         f"  Token: {redacted}",
-        f"  Account ID: {CONFIG.get('accountId', '?')}",
-        f"  Base URL: {CONFIG.get('baseUrl', tempo_api.BASE_URL)}",
+        f"  Account ID: {config.get('accountId', '?')}",
+        f"  Base URL: {config.get('baseUrl', tempo_api.BASE_URL)}",
         "",
         "Issue Mappings:",
     ]
-    for key, issue_id in CONFIG.get("issueIds", {}).items():
+    for key, issue_id in config.get("issueIds", {}).items():
         lines.append(f"  {key} → {issue_id}")
 
     lines.append("")
     lines.append("Presets:")
-    for name, entries in CONFIG.get("presets", {}).items():
+    for name, entries in config.get("presets", {}).items():
+        if name in config["_preset_errors"]:
+            lines.append(f"  {name}: ⚠️ {config['_preset_errors'][name]}")
+            continue
         entry_parts = [
             f"{e['issueKey']} ({e['percentage']}%)" for e in entries
         ]
@@ -309,7 +479,6 @@ def tempo_get_config() -> str:
     return "\n".join(lines)
 
 
-@mcp.tool()
 def tempo_search_user(name: str) -> str:
     """Search for a Jira/Tempo user by name.
 
@@ -322,12 +491,13 @@ def tempo_search_user(name: str) -> str:
     Returns:
         List of matching users with accountId and display name.
     """
-    if _CONFIG_ERROR:
-        return f"❌ Configuration error: {_CONFIG_ERROR}"
+    config, config_error = _get_config()
+    if config_error:
+        return f"❌ Configuration error: {config_error}"
 
-    jira_base_url = CONFIG.get("jiraBaseUrl")
-    jira_email = CONFIG.get("jiraEmail")
-    jira_token = CONFIG.get("jiraToken")
+    jira_base_url = config.get("jiraBaseUrl")
+    jira_email = config.get("jiraEmail")
+    jira_token = config.get("jiraToken")
 
     if not jira_base_url or not jira_email or not jira_token:
         return (
@@ -340,19 +510,40 @@ def tempo_search_user(name: str) -> str:
         )
 
     try:
-        users = tempo_api.search_jira_users(jira_base_url, jira_email, jira_token, name)
+        users = _search_users(config, name)
     except tempo_api.TempoAPIError as e:
         return f"❌ Jira user search failed: {e}"
 
-    active = [u for u in users if u["active"]]
-    if not active:
+    if not users:
         return f"No active users found matching '{name}'."
 
-    lines = [f"Found {len(active)} user(s) matching '{name}':"]
-    for u in active:
+    lines = [f"Found {len(users)} user(s) matching '{name}':"]
+    for u in users:
         lines.append(f"  • {u['displayName']} ({u['emailAddress']}) — accountId: {u['accountId']}")
     return "\n".join(lines)
 
 
+_SERVER = None
+
+
+def _get_server():
+    """Build the FastMCP server, deferring the mcp import until it is needed."""
+    global _SERVER
+    if _SERVER is None:
+        from mcp.server.fastmcp import FastMCP
+
+        _SERVER = FastMCP("tempo")
+        for tool in (tempo_log_time, tempo_get_workload, tempo_get_config, tempo_search_user):
+            _SERVER.tool()(tool)
+    return _SERVER
+
+
+def __getattr__(name: str):
+    # Keep `mcp_server.mcp` available for the `mcp` CLI without eager import
+    if name == "mcp":
+        return _get_server()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 if __name__ == "__main__":
-    mcp.run()
+    _get_server().run()
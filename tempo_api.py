@@ -1,19 +1,87 @@
 """Pure Python client for the Tempo REST API v4."""
 
+import base64
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib codec
+    import json
+    from json import loads as _json_loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
 
 BASE_URL = "https://api.tempo.io/4"
 
+# Seconds to wait for a connection or a response before giving up
+TIMEOUT = 10.0
+
+# Maximum number of worklog POSTs in flight at once (fits within pool_maxsize)
+BULK_CONCURRENCY = 4
+
+
+def _new_session() -> requests.Session:
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json"})
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            # Retry transient failures for GETs only: worklog POSTs are not
+            # idempotent, and a retried POST could log the same time twice.
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=frozenset(["GET"]),
+                raise_on_status=False,
+            ),
+        ),
+    )
+    return session
+
+
+# Shared sessions so every call reuses pooled keep-alive connections instead
+# of paying a fresh TCP+TLS handshake per request. Credentials are attached
+# once via configure_session() / configure_jira_session().
+_SESSION = _new_session()
+_JIRA_SESSION = _new_session()
+
 
 class TempoAPIError(Exception):
-    """Raised when the Tempo API returns a non-2xx response."""
+    """Raised when the Tempo API returns a non-2xx response or cannot be reached."""
 
 
-def _headers(token: str) -> dict:
-    return {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json",
-    }
+class TempoAPIStatusUnknownError(TempoAPIError):
+    """Raised when a write was sent but no response arrived, so it may have been applied."""
+
+
+def configure_session(token: str) -> None:
+    """Set the Tempo API bearer token used by all Tempo requests.
+
+    Args:
+        token: Tempo API bearer token.
+    """
+    _SESSION.headers["Authorization"] = f"Bearer {token}"
+
+
+def configure_jira_session(jira_email: str, jira_token: str) -> None:
+    """Set the Basic Auth credentials used by Jira requests.
+
+    Args:
+        jira_email: Atlassian account email for Basic Auth
+        jira_token: Jira API token for Basic Auth
+    """
+    # Encode once here; a requests auth tuple would re-encode on every request
+    credentials = base64.b64encode(f"{jira_email}:{jira_token}".encode()).decode()
+    _JIRA_SESSION.headers["Authorization"] = f"Basic {credentials}"
 
 
 def _check_response(resp: requests.Response) -> None:
@@ -21,11 +89,27 @@ def _check_response(resp: requests.Response) -> None:
         raise TempoAPIError(f"Tempo API error {resp.status_code}: {resp.text}")
 
 
-def get_user_schedule(token: str, date: str, account_id: str = "") -> dict:
+def _send(session: requests.Session, method: str, url: str, **kwargs) -> requests.Response:
+    """Issue a request with the default timeout, raising TempoAPIError on any failure."""
+    try:
+        resp = session.request(method, url, timeout=TIMEOUT, **kwargs)
+    except requests.ReadTimeout as e:
+        if method == "POST":
+            # The request reached the server, which may still have created the worklog
+            raise TempoAPIStatusUnknownError(
+                f"No response from {url} within {TIMEOUT:g}s; status unknown"
+            )
+        raise TempoAPIError(f"Request to {url} failed: {e}")
+    except requests.RequestException as e:
+        raise TempoAPIError(f"Request to {url} failed: {e}")
+    _check_response(resp)
+    return resp
+
+
+def get_user_schedule(date: str, account_id: str = "") -> dict:
     """Get the user's schedule for a single date.
 
     Args:
-        token: Tempo API bearer token.
         date: ISO date string (YYYY-MM-DD).
         account_id: Optional Atlassian account ID. If empty, uses token owner.
 
@@ -35,27 +119,25 @@ def get_user_schedule(token: str, date: str, account_id: str = "") -> dict:
     params = {"from": date, "to": date}
     if account_id:
         params["accountId"] = account_id
-    resp = requests.get(
+    resp = _send(
+        _SESSION,
+        "GET",
         f"{BASE_URL}/user-schedule",
-        headers=_headers(token),
         params=params,
     )
-    _check_response(resp)
-    return resp.json()["results"][0]
+    return _json_loads(resp.content)["results"][0]
 
 
-def create_worklog(
-    token: str,
+def build_worklog_payload(
     account_id: str,
     issue_id: int,
     seconds: int,
     date: str,
     description: str,
 ) -> dict:
-    """Create a worklog entry in Tempo.
+    """Build the request body for a single worklog.
 
     Args:
-        token: Tempo API bearer token.
         account_id: Jira/Atlassian account ID of the author.
         issue_id: Jira issue ID (integer, NOT the issue key string).
         seconds: Time spent in seconds.
@@ -63,9 +145,9 @@ def create_worklog(
         description: Worklog description text.
 
     Returns:
-        Full worklog response dict from the API.
+        Payload dict accepted by create_worklogs_bulk().
     """
-    payload = {
+    return {
         "authorAccountId": account_id,
         "issueId": issue_id,
         "timeSpentSeconds": seconds,
@@ -73,73 +155,122 @@ def create_worklog(
         "startTime": "08:00:00",
         "description": description,
     }
-    resp = requests.post(
+
+
+def _post_worklog(payload: dict) -> dict:
+    resp = _send(
+        _SESSION,
+        "POST",
         f"{BASE_URL}/worklogs",
-        headers=_headers(token),
-        json=payload,
+        data=_json_dumps(payload),
     )
-    _check_response(resp)
-    return resp.json()
+    return _json_loads(resp.content)
 
 
-def get_worklogs_for_date(token: str, account_id: str, date: str) -> list[dict]:
+def create_worklog(
+    account_id: str,
+    issue_id: int,
+    seconds: int,
+    date: str,
+    description: str,
+) -> dict:
+    """Create a worklog entry in Tempo.
+
+    Args:
+        account_id: Jira/Atlassian account ID of the author.
+        issue_id: Jira issue ID (integer, NOT the issue key string).
+        seconds: Time spent in seconds.
+        date: ISO date string (YYYY-MM-DD).
+        description: Worklog description text.
+
+    Returns:
+        Full worklog response dict from the API.
+    """
+    return _post_worklog(
+        build_worklog_payload(account_id, issue_id, seconds, date, description)
+    )
+
+
+def create_worklogs_bulk(payloads: list[dict]) -> list:
+    """Create several worklogs, submitting up to BULK_CONCURRENCY at a time.
+
+    Tempo v4 has no bulk endpoint spanning multiple issues, so the POSTs are
+    issued concurrently over the shared session instead. One failing entry
+    does not stop the others.
+
+    Args:
+        payloads: Worklog bodies from build_worklog_payload().
+
+    Returns:
+        List in the same order as payloads; each item is either the worklog
+        response dict or the TempoAPIError raised for that entry (a
+        TempoAPIStatusUnknownError if the POST timed out after being sent).
+    """
+    def submit(payload: dict):
+        try:
+            return _post_worklog(payload)
+        except TempoAPIError as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=BULK_CONCURRENCY) as ex:
+        return list(ex.map(submit, payloads))
+
+
+def get_worklogs_for_date(account_id: str, date: str) -> list[dict]:
     """Get all worklogs for a specific user on a specific date.
 
+    Uses the per-user endpoint so only the user's own worklogs are
+    transferred, rather than every worklog in the organisation.
+
     Args:
-        token: Tempo API bearer token.
-        account_id: Jira/Atlassian account ID to filter by.
+        account_id: Jira/Atlassian account ID whose worklogs to fetch.
         date: ISO date string (YYYY-MM-DD).
 
     Returns:
         List of worklog dicts with keys: tempoWorklogId, issue, timeSpentSeconds,
         startDate, description, author.
     """
-    resp = requests.get(
-        f"{BASE_URL}/worklogs",
-        headers=_headers(token),
+    resp = _send(
+        _SESSION,
+        "GET",
+        # account_id may be raw user input; escape it so it stays one path segment
+        f"{BASE_URL}/worklogs/user/{quote(account_id, safe=':')}",
         params={"from": date, "to": date},
     )
-    _check_response(resp)
-    results = resp.json().get("results", [])
-    return [
-        wl for wl in results if wl.get("author", {}).get("accountId") == account_id
-    ]
+    return _json_loads(resp.content).get("results", [])
 
 
+def search_jira_users(jira_base_url: str, query: str, max_results: int = 10) -> list[dict]:
+    """Search active Jira users by display name.
 
-def search_jira_users(jira_base_url: str, jira_email: str, jira_token: str, query: str) -> list[dict]:
-    """Search Jira users by display name.
+    Requires configure_jira_session() to have been called first. The Jira
+    endpoint has no active/account-type filter, so both are applied here in
+    the same pass that builds the result.
 
     Args:
         jira_base_url: Jira instance base URL (e.g. "https://yourorg.atlassian.net")
-        jira_email: Atlassian account email for Basic Auth
-        jira_token: Jira API token for Basic Auth
         query: Name search string (e.g. "Alice")
+        max_results: Maximum number of users Jira should return, before the
+            active/account-type filter is applied.
 
     Returns:
         List of dicts with keys: accountId, displayName, emailAddress, active
     """
-    import base64
-    credentials = base64.b64encode(f"{jira_email}:{jira_token}".encode()).decode()
-    headers = {
-        "Authorization": f"Basic {credentials}",
-        "Content-Type": "application/json",
-    }
-    resp = requests.get(
+    resp = _send(
+        _JIRA_SESSION,
+        "GET",
         f"{jira_base_url}/rest/api/3/user/search",
-        headers=headers,
-        params={"query": query, "maxResults": 10},
+        params={"query": query, "maxResults": max_results},
     )
-    _check_response(resp)
     return [
         {
             "accountId": u["accountId"],
             "displayName": u.get("displayName", ""),
             "emailAddress": u.get("emailAddress", ""),
-            "active": u.get("active", True),
+            "active": True,
         }
-        for u in resp.json()
-        if u.get("accountType") == "atlassian"
+        for u in _json_loads(resp.content)
+        if u.get("accountType") == "atlassian" and u.get("active", True)
     ]
 
 